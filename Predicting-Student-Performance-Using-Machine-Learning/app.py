@@ -12,16 +12,20 @@ import uuid
 from datetime import datetime
 from pathlib import Path
 from io import StringIO
+from src.pipeline.prediction_cache import PredictionCache
 
 app = Flask(__name__)
 
 # Database Configuration
 BASE_DIR = os.path.abspath(os.path.dirname(__file__))
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + os.path.join(BASE_DIR, 'users.db')
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('STUDENT_APP_DATABASE_URI', 'sqlite:///' + os.path.join(BASE_DIR, 'users.db'))
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 app.config['SECRET_KEY'] = 'd0fcf28f55e4f6c736362c3a2fc7b71c'
-app.config['UPLOAD_FOLDER'] = 'uploads'
+app.config['UPLOAD_FOLDER'] = os.environ.get('UPLOAD_FOLDER', 'uploads')
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB file limit
+app.config['PREDICTION_CACHE_PATH'] = os.environ.get('PREDICTION_CACHE_PATH', os.path.join(app.instance_path, 'prediction_cache.db'))
+app.config['PREDICTION_CACHE_SIZE'] = 10000
+app.config['PREDICTION_CACHE_TTL'] = 3600  # seconds
 
 db = SQLAlchemy(app)
 
@@ -51,6 +55,11 @@ with app.app_context():
 # Ensure upload folder exists
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
+# Prediction cache shared by all worker processes
+prediction_cache = PredictionCache(app.config['PREDICTION_CACHE_PATH'],
+                                   max_entries=app.config['PREDICTION_CACHE_SIZE'],
+                                   ttl_seconds=app.config['PREDICTION_CACHE_TTL'])
+
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in {'csv', 'xlsx'}
 
@@ -152,11 +161,18 @@ def predict():
                 "participation_score": to_float(request.form.get("participation_score"))
             }
             
-            # Load model
-            model_path = os.path.join(app.config['UPLOAD_FOLDER'], f"model_{session.get('current_file_id')}.pkl")
-            model_data = joblib.load(model_path)
-            model = model_data['model']
-            trained_features = model_data['features']
+            file_id = session.get('current_file_id')
+            model_path = os.path.join(app.config['UPLOAD_FOLDER'], f"model_{file_id}.pkl")
+            model_version = PredictionCache.model_version(model_path)
+
+            # Load model only when the cache doesn't know its features or the prediction
+            model = None
+            trained_features = prediction_cache.get_model_features(file_id, model_version)
+            if trained_features is None:
+                model_data = joblib.load(model_path)
+                model = model_data['model']
+                trained_features = model_data['features']
+                prediction_cache.set_model_features(file_id, model_version, trained_features)
 
             # Prepare features in the exact order used during training
             features = [student_data[feature] for feature in trained_features]
@@ -164,9 +180,15 @@ def predict():
             # Validate feature count
             if len(features) != len(trained_features):
                 raise ValueError(f"Expected {len(trained_features)} features, got {len(features)}")
-            
-            # Make prediction
-            prediction = model.predict([features])[0]
+
+            prediction = prediction_cache.get(file_id, model_version, features)
+            if prediction is None:
+                if model is None:
+                    model = joblib.load(model_path)['model']
+
+                # Make prediction
+                prediction = float(model.predict([features])[0])
+                prediction_cache.set(file_id, model_version, features, prediction)
             
             # Performance evaluation
             if prediction >= 80:
@@ -309,6 +331,7 @@ def train_model():
         # Save model
         model_path = os.path.join(app.config['UPLOAD_FOLDER'], f"model_{data_file.id}.pkl")
         joblib.dump({'model': model, 'features': available_features}, model_path)
+        prediction_cache.invalidate(data_file.id)
         
         # Load the model and features
         model_data = joblib.load(model_path)
@@ -330,5 +353,11 @@ def train_model():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/cache_stats')
+def cache_stats():
+    if 'user_id' not in session:
+        return jsonify({'error': 'Please login first'}), 401
+    return jsonify(prediction_cache.stats())
+
 if __name__ == "__main__":
     app.run(debug=True)
\ No newline at end of file
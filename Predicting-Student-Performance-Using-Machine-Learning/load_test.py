@@ -0,0 +1,308 @@
+# ******************************************************************
+# * Load Test : Simulates concurrent teachers going through the    *
+# *             real app flow and reports per route                *
+# *             -> throughput, error rate                          *
+# *             -> latency percentiles                             *
+# ******************************************************************
+import argparse
+import csv
+import http.client
+import http.cookiejar
+import io
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+BASE_DIR = os.path.abspath(os.path.dirname(__file__))
+
+# Same columns as uploads/Students_Grading_Dataset.csv
+DATASET_COLUMNS = [
+    "Student_ID", "First_Name", "Last_Name", "Email", "Gender", "Age", "Department",
+    "Attendance (%)", "Midterm_Score", "Final_Score", "Assignments_Avg", "Quizzes_Avg",
+    "Participation_Score", "Projects_Score", "Total_Score", "Grade", "Study_Hours_per_Week",
+    "Extracurricular_Activities", "Internet_Access_at_Home", "Parent_Education_Level",
+    "Family_Income_Level", "Stress_Level (1-10)", "Sleep_Hours_per_Night",
+]
+
+# Flow weights, "upload" covers upload -> preview -> train_model
+DEFAULT_MIX = {"predict": 70, "preview": 20, "upload": 10}
+
+
+def make_synthetic_dataset(n_rows, rng):
+    '''
+    Returns csv bytes shaped like uploads/Students_Grading_Dataset.csv
+    '''
+    first_names = ["Omar", "Maria", "Ahmed", "John", "Liam", "Emma", "Sara", "Ali"]
+    last_names = ["Williams", "Brown", "Jones", "Smith", "Davis", "Johnson"]
+    departments = ["Engineering", "Business", "Mathematics", "CS"]
+    education = ["None", "High School", "Bachelor's", "Master's", "PhD"]
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(DATASET_COLUMNS)
+    for i in range(n_rows):
+        midterm = round(rng.uniform(40, 100), 2)
+        final = round(rng.uniform(40, 100), 2)
+        assignments = round(rng.uniform(50, 100), 2)
+        writer.writerow([
+            f"S{1000 + i}", rng.choice(first_names), rng.choice(last_names),
+            f"student{i}@university.com", rng.choice(["Male", "Female"]), rng.randint(18, 24),
+            rng.choice(departments), round(rng.uniform(50, 100), 2), midterm, final,
+            # leave some gaps like the real dataset
+            assignments if rng.random() > 0.1 else "", round(rng.uniform(50, 100), 2),
+            round(rng.uniform(0, 10), 2), round(rng.uniform(50, 100), 2),
+            round((midterm + final + assignments) / 3, 2), rng.choice("ABCDF"),
+            round(rng.uniform(5, 30), 1), rng.choice(["Yes", "No"]), rng.choice(["Yes", "No"]),
+            rng.choice(education), rng.choice(["Low", "Medium", "High"]), rng.randint(1, 10),
+            round(rng.uniform(4, 9), 1),
+        ])
+    return buffer.getvalue().encode()
+
+
+class NoRedirect(urllib.request.HTTPRedirectHandler):
+    # the app reports most failures with a flash + redirect, so redirects are checked instead of followed
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+class Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def record(self, route, latency, ok):
+        with self.lock:
+            self.latencies[route].append(latency)
+            if not ok:
+                self.errors[route] += 1
+
+    def report(self, elapsed):
+        report = {}
+        for route, latencies in sorted(self.latencies.items()):
+            latencies_ms = np.array(latencies) * 1000
+            report[route] = {
+                "requests": len(latencies),
+                "errors": self.errors[route],
+                "error_rate": self.errors[route] / len(latencies),
+                "throughput": len(latencies) / elapsed,
+                "p50_ms": float(np.percentile(latencies_ms, 50)),
+                "p90_ms": float(np.percentile(latencies_ms, 90)),
+                "p95_ms": float(np.percentile(latencies_ms, 95)),
+                "p99_ms": float(np.percentile(latencies_ms, 99)),
+                "max_ms": float(latencies_ms.max()),
+            }
+        return report
+
+
+class SimulatedUser:
+    def __init__(self, base_url, stats, rng, n_rows):
+        self.base_url = base_url
+        self.stats = stats
+        self.rng = rng
+        self.n_rows = n_rows
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()), NoRedirect
+        )
+        self.username = f"user_{uuid.uuid4().hex[:12]}"
+        self.password = "load-test-password"
+
+    def request(self, route, data=None, headers=None, expect_status=200, expect_location=None):
+        '''
+        Sends one request and records its latency, returns (status, body)
+        '''
+        req = urllib.request.Request(self.base_url + route, data=data, headers=headers or {})
+        start = time.perf_counter()
+        try:
+            with self.opener.open(req, timeout=120) as response:
+                status, location, body = response.status, None, response.read()
+        except urllib.error.HTTPError as e:
+            status, location = e.code, e.headers.get("Location")
+            try:
+                body = e.read()
+            except (http.client.HTTPException, OSError):
+                status, location, body = None, None, b""
+        except (urllib.error.URLError, http.client.HTTPException, OSError):
+            status, location, body = None, None, b""
+        latency = time.perf_counter() - start
+
+        ok = status == expect_status
+        if ok and expect_location is not None:
+            ok = urllib.parse.urlparse(location or "").path == expect_location
+        self.stats.record(route, latency, ok)
+        return status, body
+
+    def post_form(self, route, fields, **expect):
+        data = urllib.parse.urlencode(fields).encode()
+        return self.request(route, data=data,
+                            headers={"Content-Type": "application/x-www-form-urlencoded"}, **expect)
+
+    def register_and_login(self):
+        self.post_form("/register", {
+            "username": self.username,
+            "email": f"{self.username}@example.com",
+            "password": self.password,
+        }, expect_status=302, expect_location="/login")
+        self.post_form("/login", {"username": self.username, "password": self.password},
+                       expect_status=302, expect_location="/dashboard")
+
+    def upload(self):
+        boundary = uuid.uuid4().hex
+        body = (
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="file"; filename="students.csv"\r\n'
+            f"Content-Type: text/csv\r\n\r\n"
+        ).encode() + make_synthetic_dataset(self.n_rows, self.rng) + f"\r\n--{boundary}--\r\n".encode()
+        self.request("/upload", data=body,
+                     headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
+                     expect_status=302, expect_location="/preview")
+        self.preview()
+        self.request("/train_model", data=b"", headers={"Content-Type": "application/json"})
+
+    def preview(self):
+        self.request("/preview")
+
+    def predict(self):
+        # a small pool of inputs so repeated what-if submits show up as well
+        self.post_form("/predict", {
+            "name": "Student",
+            "attendance_percent": self.rng.choice([60, 75, 90]),
+            "midterm_score": self.rng.choice([50, 70, 85]),
+            "private_class": self.rng.choice(["YES", "NO"]),
+            "physical_fitness": self.rng.choice(["YES", "NO"]),
+            "mental_fitness": self.rng.choice(["YES", "NO"]),
+            "subject1_duration": self.rng.choice([1, 2]),
+            "subject2_duration": self.rng.choice([1, 2]),
+            "test_preparation_course": self.rng.choice(["completed", "none"]),
+            "participation_score": self.rng.choice([3, 6, 9]),
+        })
+
+    def run(self, mix, iterations):
+        self.register_and_login()
+        self.upload()
+        flows = list(mix)
+        weights = [mix[flow] for flow in flows]
+        for _ in range(iterations):
+            getattr(self, self.rng.choices(flows, weights=weights)[0])()
+
+
+def get_free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def read_log_tail(log_path, n_lines=30):
+    with open(log_path, errors="replace") as log_file:
+        return "".join(log_file.readlines()[-n_lines:])
+
+
+def start_app(tmp_dir, port):
+    '''
+    Starts app.py in a subprocess with a temporary users.db, upload folder and prediction cache
+    '''
+    env = dict(os.environ)
+    env["STUDENT_APP_DATABASE_URI"] = "sqlite:///" + os.path.join(tmp_dir, "users.db")
+    env["UPLOAD_FOLDER"] = os.path.join(tmp_dir, "uploads")
+    env["PREDICTION_CACHE_PATH"] = os.path.join(tmp_dir, "prediction_cache.db")
+    log_path = os.path.join(tmp_dir, "app.log")
+    with open(log_path, "wb") as log_file:
+        process = subprocess.Popen(
+            [sys.executable, "-c",
+             f"from app import app; app.run(host='127.0.0.1', port={port}, threaded=True, debug=False)"],
+            cwd=BASE_DIR, env=env, stdout=log_file, stderr=subprocess.STDOUT,
+        )
+
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"App exited during startup:\n{read_log_tail(log_path)}")
+        try:
+            urllib.request.urlopen(base_url + "/", timeout=2).close()
+            return process, base_url
+        except (urllib.error.URLError, http.client.HTTPException, OSError):
+            time.sleep(0.5)
+    process.terminate()
+    process.wait()
+    raise RuntimeError(f"App did not start within 60 seconds:\n{read_log_tail(log_path)}")
+
+
+def parse_mix(value):
+    mix = {}
+    for item in value.split(","):
+        flow, weight = item.split("=")
+        if flow not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"Unknown flow: {flow}")
+        mix[flow] = float(weight)
+    return mix
+
+
+def print_report(report, elapsed, users):
+    print(f"\n{users} users, {elapsed:.1f}s")
+    print(f"{'route':<14}{'reqs':>7}{'err %':>8}{'req/s':>9}{'p50':>9}{'p90':>9}{'p95':>9}{'p99':>9}{'max':>9}")
+    for route, r in report.items():
+        print(f"{route:<14}{r['requests']:>7}{r['error_rate'] * 100:>8.1f}{r['throughput']:>9.2f}"
+              f"{r['p50_ms']:>9.1f}{r['p90_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}{r['max_ms']:>9.1f}")
+    print("latencies in ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-user load generator for app.py")
+    parser.add_argument("--users", type=int, default=10, help="concurrent simulated users")
+    parser.add_argument("--iterations", type=int, default=20, help="flows per user after setup")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX,
+                        help="flow weights, e.g. predict=70,preview=20,upload=10")
+    parser.add_argument("--rows", type=int, default=500, help="rows per synthetic dataset")
+    parser.add_argument("--url", help="target an already running instance instead of starting one")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="load_test_")
+    process = None
+    try:
+        if args.url:
+            base_url = args.url.rstrip("/")
+        else:
+            process, base_url = start_app(tmp_dir, get_free_port())
+
+        stats = Stats()
+        users = [SimulatedUser(base_url, stats, random.Random(args.seed + i), args.rows)
+                 for i in range(args.users)]
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.users) as executor:
+            for future in [executor.submit(user.run, args.mix, args.iterations) for user in users]:
+                future.result()
+        elapsed = time.perf_counter() - start
+
+        report = stats.report(elapsed)
+        print_report(report, elapsed, args.users)
+        if args.json:
+            with open(args.json, "w") as file_obj:
+                json.dump({"users": args.users, "elapsed": elapsed, "routes": report}, file_obj, indent=4)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -55,8 +55,8 @@ if __name__ == "__main__":
     train_data, test_data = obj.initiate_data_ingestion()
 
     data_transformation = DataTransformation()
-    train_arr,test_arr,_=data_transformation.initiate_data_transformation(train_data,test_data)
+    X_train,y_train,X_test,y_test,_=data_transformation.initiate_data_transformation(train_data,test_data)
 
     model_trainer = ModelTrainer()
-    acc=model_trainer.initiate_model_trainer(train_arr,test_arr)
+    acc=model_trainer.initiate_model_trainer(X_train,y_train,X_test,y_test)
     print(acc)
\ No newline at end of file
@@ -11,7 +11,7 @@ import pandas as pd
 from sklearn.compose import ColumnTransformer  # create pipeline for ohc or standardscaling, if want to use in form of pipeline
 from sklearn.impute import SimpleImputer # for missing data
 from sklearn.pipeline import Pipeline
-from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from sklearn.preprocessing import FunctionTransformer, OneHotEncoder, StandardScaler
 
 from src.exception import CustomException
 from src.logger import logging
@@ -19,6 +19,9 @@ import os
 
 from src.utils import save_object
 
+def to_float32(X):
+    return X.astype(np.float32)
+
 @dataclass
 class DataTransformationConfig:
     preprocessor_obj_file_path = os.path.join('artifacts', 'preprocessor.pkl')
@@ -32,7 +35,7 @@ class DataTransformation:
 
         '''
         This fuction is resposible for Data Transformation
-        
+        Output is a float32 sparse (CSR) matrix so the one-hot block is never densified
         '''
 
         try:
@@ -47,6 +50,7 @@ class DataTransformation:
 
             num_pipeline = Pipeline(
                 steps = [
+                    ("to_float32", FunctionTransformer(to_float32)), # imputer and scaler keep the dtype
                     ("imputer", SimpleImputer(strategy="median")),
                     ("scaler", StandardScaler())
                 ]
@@ -54,7 +58,7 @@ class DataTransformation:
             cat_pipeline = Pipeline(
                 steps=[
                     ("imputer", SimpleImputer(strategy="most_frequent")), # replacing with mode
-                    ("one_hot_encoder",OneHotEncoder()),
+                    ("one_hot_encoder",OneHotEncoder(dtype=np.float32)),
                     ("scaler",StandardScaler(with_mean=False))
                 ]
             )
@@ -62,11 +66,13 @@ class DataTransformation:
             logging.info(f"Categorical Columns: {categorical_columns}")
             logging.info(f"Numerical Columns: {numerical_columns}")
             
+            # both branches emit float32, so the stacked matrix is float32 without an extra copy
             preprocessor = ColumnTransformer(
                 [
                     ("num_pipeline", num_pipeline,numerical_columns),
                     ("cat_pipeline",cat_pipeline,categorical_columns)
-                ]
+                ],
+                sparse_threshold=1.0 # always keep the stacked output sparse
             )
             return preprocessor
 
@@ -94,16 +100,12 @@ class DataTransformation:
 
             logging.info(f"Applying preprocesing object on training and testing dataframe")
 
+            # features stay sparse float32, targets are kept apart instead of being glued on with np.c_
             input_feature_train_arr = preprocessing_obj.fit_transform(input_feature_train_df)
             input_feature_test_arr = preprocessing_obj.transform(input_feature_test_df)
 
-            train_arr = np.c_[
-                input_feature_train_arr,np.array(target_feature_train_df)
-            ]
-
-            test_arr = np.c_[
-                input_feature_test_arr,np.array(target_feature_test_df)
-            ]
+            target_feature_train_arr = target_feature_train_df.to_numpy(dtype=np.float32)
+            target_feature_test_arr = target_feature_test_df.to_numpy(dtype=np.float32)
 
             logging.info(f"Saved preprocessing object")
 
@@ -112,7 +114,11 @@ class DataTransformation:
             )
 
             return(
-                train_arr,test_arr,self.data_transformation_config.preprocessor_obj_file_path
+                input_feature_train_arr,
+                target_feature_train_arr,
+                input_feature_test_arr,
+                target_feature_test_arr,
+                self.data_transformation_config.preprocessor_obj_file_path
             )
 
 
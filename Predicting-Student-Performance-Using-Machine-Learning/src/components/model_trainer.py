@@ -1,3 +1,4 @@
+import json
 import os
 import sys
 from dataclasses import dataclass
@@ -18,20 +19,66 @@ from src.utils import save_object,evaluate_models
 @dataclass
 class ModelTrainerConfig:
     trained_model_file_path = os.path.join("artifacts", "model.pkl")
+    model_report_file_path = os.path.join("artifacts", "model_report.json")
+    # "score" -> best test R2 only
+    # "penalized" -> test R2 minus latency and size penalties
+    # "pareto" -> fastest model on the (R2, latency, size) Pareto front within score_tolerance of the best R2
+    selection_policy: str = "penalized"
+    latency_penalty: float = 0.01  # R2 points lost per millisecond of single-row predict latency
+    size_penalty: float = 0.001  # R2 points lost per MB of serialized model
+    score_tolerance: float = 0.01
+    min_test_score: float = 0.6  # models below this test R2 are never selected
 
 class ModelTrainer:
-    def __init__(self):
-        self.model_trainer_config = ModelTrainerConfig()
+    def __init__(self,config:ModelTrainerConfig=None):
+        self.model_trainer_config = config if config is not None else ModelTrainerConfig()
 
-    def initiate_model_trainer(self,train_array,test_array):
+    def get_pareto_front(self,model_report):
+        '''
+        Returns the names of the models not dominated on (test score, single-row latency, size)
+        '''
+        def dominates(a,b):
+            no_worse = (a["test_score"]>=b["test_score"]
+                        and a["single_predict_latency"]<=b["single_predict_latency"]
+                        and a["model_size"]<=b["model_size"])
+            better = (a["test_score"]>b["test_score"]
+                      or a["single_predict_latency"]<b["single_predict_latency"]
+                      or a["model_size"]<b["model_size"])
+            return no_worse and better
+
+        return [
+            name for name,stats in model_report.items()
+            if not any(dominates(other,stats) for other_name,other in model_report.items() if other_name!=name)
+        ]
+
+    def select_best_model(self,model_report):
+        '''
+        Picks the model to ship according to model_trainer_config.selection_policy
+        '''
+        config = self.model_trainer_config
+        policy = config.selection_policy
+
+        if policy=="score":
+            return max(model_report,key=lambda name: model_report[name]["test_score"])
+
+        if policy=="penalized":
+            def penalized_score(name):
+                stats = model_report[name]
+                return (stats["test_score"]
+                        - config.latency_penalty*stats["single_predict_latency"]*1000
+                        - config.size_penalty*stats["model_size"]/(1024*1024))
+            return max(model_report,key=penalized_score)
+
+        if policy=="pareto":
+            front = self.get_pareto_front(model_report)
+            best_score = max(model_report[name]["test_score"] for name in front)
+            candidates = [name for name in front if model_report[name]["test_score"]>=best_score-config.score_tolerance]
+            return min(candidates,key=lambda name: (model_report[name]["single_predict_latency"],model_report[name]["model_size"]))
+
+        raise ValueError(f"Unknown selection policy: {policy}")
+
+    def initiate_model_trainer(self,X_train,y_train,X_test,y_test):
         try:
-            logging.info("Split training and test input data")
-            X_train,y_train,X_test,y_test =(
-                train_array[:,:-1],
-                train_array[:,-1],
-                test_array[:,:-1],
-                test_array[:,-1]
-                )
             models = {
                 "Random Forest": RandomForestRegressor(),
                 "Decision Tree": DecisionTreeRegressor(),
@@ -83,17 +130,34 @@ class ModelTrainer:
             model_report:dict=evaluate_models(X_train=X_train,y_train=y_train,X_test=X_test,y_test=y_test,
                                              models=models,param=params)
             
-            # to get best model score from dict
-            best_model_score = max(sorted(model_report.values()))
+            config = self.model_trainer_config
 
-            # best model score name
-            best_model_name = list(model_report.keys())[list(model_report.values()).index(best_model_score)]
+            # only acceptable models compete, so a cheap but weak model can't win on cost alone
+            eligible_report = {
+                name: stats for name,stats in model_report.items()
+                if stats["test_score"]>=config.min_test_score
+            }
+            if not eligible_report:
+                raise ValueError("No best model found")
 
+            best_model_name = self.select_best_model(eligible_report)
             best_model = models[best_model_name]
 
-            if best_model_score<0.6:
-                raise CustomException("No best model found")
-            logging.info(f"Best found model on training and testing dataset")
+            logging.info(f"Best found model on training and testing dataset: {best_model_name} "
+                         f"(policy={config.selection_policy})")
+
+            os.makedirs(os.path.dirname(config.model_report_file_path),exist_ok=True)
+            with open(config.model_report_file_path,"w") as report_file:
+                json.dump({
+                    "selection_policy": config.selection_policy,
+                    "latency_penalty": config.latency_penalty,
+                    "size_penalty": config.size_penalty,
+                    "score_tolerance": config.score_tolerance,
+                    "min_test_score": config.min_test_score,
+                    "selected_model": best_model_name,
+                    "pareto_front": self.get_pareto_front(eligible_report),
+                    "models": model_report,
+                },report_file,indent=4,default=str)
 
             save_object(
                 file_path=self.model_trainer_config.trained_model_file_path,
@@ -0,0 +1,224 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing, contextmanager
+
+from src.logger import logging
+
+
+class PredictionCache:
+    '''
+    Bounded TTL cache of predictions keyed by (data file id, model version, feature vector).
+    Backed by a local sqlite file so every worker process of the app shares the same entries and counters.
+    The cache is best effort: sqlite errors are logged, a failed lookup is a miss and a failed write is skipped.
+
+    Lookups are read only. Hit/miss counts and last-used times are buffered per process and written
+    every `flush_every` lookups or `flush_interval` seconds, and expired/least recently used entries
+    are pruned in batches every `prune_every` inserts, so the shared write lock is taken rarely.
+    '''
+    def __init__(self, db_path, max_entries=10000, ttl_seconds=3600,
+                 flush_every=100, flush_interval=30, prune_every=100):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.prune_every = prune_every
+
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._touched = {}  # (file_id, model_version, features) -> last used time
+        self._last_flush = time.time()
+        self._sets_since_prune = 0
+
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        try:
+            with self._connect() as conn:
+                # WAL lets readers and the writer of other workers run concurrently
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS predictions ("
+                    "file_id TEXT, model_version TEXT, features TEXT, prediction REAL, "
+                    "expires_at REAL, last_used REAL, "
+                    "PRIMARY KEY (file_id, model_version, features))"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS predictions_expires_at ON predictions (expires_at)")
+                conn.execute("CREATE INDEX IF NOT EXISTS predictions_last_used ON predictions (last_used)")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS models ("
+                    "file_id TEXT, model_version TEXT, features TEXT, "
+                    "PRIMARY KEY (file_id, model_version))"
+                )
+                conn.execute("CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value INTEGER)")
+                conn.execute("INSERT OR IGNORE INTO stats VALUES ('hits', 0), ('misses', 0), ('invalidations', 0)")
+        except sqlite3.Error as e:
+            logging.warning(f"Prediction cache unavailable: {e}")
+
+    @contextmanager
+    def _connect(self):
+        with closing(sqlite3.connect(self.db_path, timeout=10)) as conn:
+            with conn:
+                yield conn
+
+    @staticmethod
+    def model_version(model_path):
+        '''Version of a saved model, changes whenever the model file is rewritten'''
+        st = os.stat(model_path)
+        return f"{st.st_mtime_ns}-{st.st_size}"
+
+    @staticmethod
+    def normalize_features(features):
+        '''Stable key for a feature vector, floats rounded to absorb form formatting noise'''
+        return json.dumps([
+            round(float(value), 6) if isinstance(value, (int, float)) else value
+            for value in features
+        ])
+
+    def get_model_features(self, file_id, model_version):
+        '''Trained feature list of a model version, so a cache hit doesn't need to load the model'''
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT features FROM models WHERE file_id=? AND model_version=?",
+                    (file_id, model_version)
+                ).fetchone()
+            return json.loads(row[0]) if row else None
+        except sqlite3.Error as e:
+            logging.warning(f"Prediction cache lookup failed: {e}")
+            return None
+
+    def set_model_features(self, file_id, model_version, trained_features):
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO models VALUES (?, ?, ?)",
+                    (file_id, model_version, json.dumps(list(trained_features)))
+                )
+        except sqlite3.Error as e:
+            logging.warning(f"Prediction cache write failed: {e}")
+
+    def get(self, file_id, model_version, features):
+        key = (file_id, model_version, self.normalize_features(features))
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT prediction FROM predictions "
+                    "WHERE file_id=? AND model_version=? AND features=? AND expires_at>?",
+                    key + (now,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logging.warning(f"Prediction cache lookup failed: {e}")
+            row = None
+
+        with self._lock:
+            if row is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+                self._touched[key] = now
+            due = (self._hits + self._misses >= self.flush_every
+                   or now - self._last_flush >= self.flush_interval)
+        if due:
+            self.flush()
+        return None if row is None else row[0]
+
+    def flush(self):
+        '''Writes this process's buffered hit/miss counts and last-used times to the shared store'''
+        with self._lock:
+            hits, misses, touched = self._hits, self._misses, self._touched
+            self._hits, self._misses, self._touched = 0, 0, {}
+            self._last_flush = time.time()
+        if not (hits or misses or touched):
+            return
+        try:
+            with self._connect() as conn:
+                conn.execute("UPDATE stats SET value=value+? WHERE name='hits'", (hits,))
+                conn.execute("UPDATE stats SET value=value+? WHERE name='misses'", (misses,))
+                conn.executemany(
+                    "UPDATE predictions SET last_used=MAX(last_used, ?) "
+                    "WHERE file_id=? AND model_version=? AND features=?",
+                    [(used,) + key for key, used in touched.items()]
+                )
+        except sqlite3.Error as e:
+            logging.warning(f"Prediction cache stats flush failed: {e}")
+
+    def set(self, file_id, model_version, features, prediction):
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO predictions VALUES (?, ?, ?, ?, ?, ?)",
+                    (file_id, model_version, self.normalize_features(features),
+                     float(prediction), now + self.ttl_seconds, now)
+                )
+        except sqlite3.Error as e:
+            logging.warning(f"Prediction cache write failed: {e}")
+            return
+
+        with self._lock:
+            self._sets_since_prune += 1
+            due = self._sets_since_prune >= self.prune_every
+            if due:
+                self._sets_since_prune = 0
+        if due:
+            self.prune()
+
+    def prune(self):
+        '''
+        Drops expired entries, then the least recently used ones when over max_entries.
+        Evicts down to 90% of max_entries so the next prunes have nothing to evict for a while.
+        '''
+        try:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM predictions WHERE expires_at<=?", (time.time(),))
+                entries = conn.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+                if entries > self.max_entries:
+                    conn.execute(
+                        "DELETE FROM predictions WHERE rowid IN ("
+                        "SELECT rowid FROM predictions ORDER BY last_used LIMIT ?)",
+                        (entries - int(self.max_entries * 0.9),)
+                    )
+                # feature lists of models with no cached predictions left
+                conn.execute(
+                    "DELETE FROM models WHERE NOT EXISTS ("
+                    "SELECT 1 FROM predictions p "
+                    "WHERE p.file_id=models.file_id AND p.model_version=models.model_version)"
+                )
+        except sqlite3.Error as e:
+            logging.warning(f"Prediction cache prune failed: {e}")
+
+    def invalidate(self, file_id):
+        '''Drops every cached prediction of a data file, called when its model is retrained'''
+        try:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM predictions WHERE file_id=?", (file_id,))
+                conn.execute("DELETE FROM models WHERE file_id=?", (file_id,))
+                conn.execute("UPDATE stats SET value=value+1 WHERE name='invalidations'")
+        except sqlite3.Error as e:
+            logging.warning(f"Prediction cache invalidation failed: {e}")
+
+    def stats(self):
+        '''Shared counters; buffered counts of other processes show up after their next flush'''
+        self.flush()
+        counters = {'hits': 0, 'misses': 0, 'invalidations': 0}
+        entries = 0
+        try:
+            with self._connect() as conn:
+                counters.update(conn.execute("SELECT name, value FROM stats").fetchall())
+                entries = conn.execute(
+                    "SELECT COUNT(*) FROM predictions WHERE expires_at>?", (time.time(),)
+                ).fetchone()[0]
+        except sqlite3.Error as e:
+            logging.warning(f"Prediction cache stats failed: {e}")
+        lookups = counters['hits'] + counters['misses']
+        return {
+            'hits': counters['hits'],
+            'misses': counters['misses'],
+            'invalidations': counters['invalidations'],
+            'entries': entries,
+            'hit_rate': counters['hits'] / lookups if lookups else 0.0,
+        }
@@ -1,5 +1,80 @@
+import os
+import sys
+import time
+
 import dill
+import numpy as np
+from sklearn.metrics import r2_score
+from sklearn.model_selection import GridSearchCV
+
+from src.exception import CustomException
+
+
+def save_object(file_path, obj):
+    try:
+        dir_path = os.path.dirname(file_path)
+        os.makedirs(dir_path, exist_ok=True)
+
+        with open(file_path, "wb") as file_obj:
+            dill.dump(obj, file_obj)
+
+    except Exception as e:
+        raise CustomException(e, sys)
+
 
 def load_object(file_path):
     with open(file_path, 'rb') as file:
         return dill.load(file)
+
+
+def measure_predict_latency(model, X, repeats=5):
+    '''
+    Returns the median wall-clock time in seconds of model.predict(X) over `repeats` calls
+    '''
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        model.predict(X)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+
+def evaluate_models(X_train, y_train, X_test, y_test, models, param):
+    '''
+    Tunes every model with GridSearchCV, refits it with the best params and
+    returns a report with its scores and serving cost:
+    {model_name: {"train_score", "test_score", "fit_time", "single_predict_latency",
+                  "batch_predict_latency", "model_size"}}
+    Times are in seconds, model_size is the serialized size in bytes.
+    '''
+    try:
+        report = {}
+
+        for model_name, model in models.items():
+            para = param.get(model_name, {})
+
+            gs = GridSearchCV(model, para, cv=3)
+            gs.fit(X_train, y_train)
+
+            model.set_params(**gs.best_params_)
+            start = time.perf_counter()
+            model.fit(X_train, y_train)
+            fit_time = time.perf_counter() - start
+
+            y_train_pred = model.predict(X_train)
+            y_test_pred = model.predict(X_test)
+
+            report[model_name] = {
+                "train_score": float(r2_score(y_train, y_train_pred)),
+                "test_score": float(r2_score(y_test, y_test_pred)),
+                "best_params": gs.best_params_,
+                "fit_time": fit_time,
+                "single_predict_latency": measure_predict_latency(model, X_test[:1], repeats=20),
+                "batch_predict_latency": measure_predict_latency(model, X_test),
+                "model_size": len(dill.dumps(model)),
+            }
+
+        return report
+
+    except Exception as e:
+        raise CustomException(e, sys)